@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import argparse
+import logging
 import sys
 import tkinter as tk
+from typing import Optional, Sequence
 
 from home_made_flux.ui.main_window import MainWindow
 from home_made_flux.services.geolocation import GeolocationService
@@ -9,24 +12,69 @@ from home_made_flux.services.geocoding import GeocodingService
 from home_made_flux.services.suntime import SunTimeService
 from home_made_flux.util.config import AppConfig, load_config
 from home_made_flux.util.logging_setup import setup_logging
+from home_made_flux.util.profiling import DEFAULT_PROFILE_DIR, TickProfiler
 from home_made_flux.windows.nightlight import NightLightController
 
 
-def main() -> int:
-    logger = setup_logging()
-    config = load_config()
-    logger.info("Loaded configuration")
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="home_made_flux")
+    parser.add_argument(
+        "--profile-every", type=int, metavar="N", help="profile every Nth scheduler tick"
+    )
+    parser.add_argument(
+        "--profile-slow-ms", type=int, metavar="MS", help="profile ticks slower than MS milliseconds"
+    )
+    parser.add_argument(
+        "--profile-memory", action="store_true", help="write tracemalloc snapshots of profiled ticks"
+    )
+    parser.add_argument(
+        "--profile-startup", action="store_true", help="profile startup until the UI is ready"
+    )
+    return parser.parse_args(argv)
+
 
-    root = tk.Tk()
-    MainWindow(
-        root=root,
-        config=config,
-        geolocation=GeolocationService(logger),
-        geocoding=GeocodingService(logger),
-        suntime=SunTimeService(logger),
-        nightlight=NightLightController(logger),
+def build_profiler(
+    config: AppConfig, args: argparse.Namespace, logger: logging.Logger
+) -> TickProfiler:
+    """CLI flags override config.json for this run only; they are never persisted."""
+    every_n = config.profile_every_n_ticks if args.profile_every is None else args.profile_every
+    slow_ms = config.profile_slow_tick_ms if args.profile_slow_ms is None else args.profile_slow_ms
+    return TickProfiler(
+        output_dir=DEFAULT_PROFILE_DIR,
+        every_n_ticks=every_n,
+        slow_tick_ms=slow_ms,
+        trace_memory=args.profile_memory or config.profile_memory,
         logger=logger,
     )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    logger = setup_logging()
+    config = load_config(logger=logger)
+    logger.info("Loaded configuration")
+    profiler = build_profiler(config, args, logger)
+
+    def start() -> tk.Tk:
+        root = tk.Tk()
+        MainWindow(
+            root=root,
+            config=config,
+            geolocation=GeolocationService(logger),
+            geocoding=GeocodingService(logger),
+            suntime=SunTimeService(logger),
+            nightlight=NightLightController(logger),
+            logger=logger,
+            profiler=profiler,
+        )
+        return root
+
+    if args.profile_startup:
+        startup_path = DEFAULT_PROFILE_DIR / "startup.prof"
+        root = profiler.profile_call(start, startup_path)
+        logger.info("Startup profile written to %s", startup_path)
+    else:
+        root = start()
     root.mainloop()
     return 0
 
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, tzinfo
+from typing import Optional
+
+
+class Clock(ABC):
+    """
+    Time source for scheduling and sun-time lookups.
+
+    Production code uses SystemClock; SimulatedClock lets the replay harness
+    run the same code through virtual time without sleeping.
+    """
+
+    @abstractmethod
+    def now(self) -> datetime:
+        """Current local time, timezone-aware."""
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        """Seconds on a monotonic scale, for measuring intervals."""
+
+    @abstractmethod
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        """Block until event is set or timeout elapses; return whether it was set."""
+
+
+class SystemClock(Clock):
+    def now(self) -> datetime:
+        return datetime.now().astimezone()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        return event.wait(timeout)
+
+
+class SimulatedClock(Clock):
+    """
+    Virtual clock that only moves when advanced.
+
+    wait() returns immediately, jumping the clock forward by the timeout
+    unless the event is already set. Time is kept as a UTC epoch so DST
+    changes in `tz` behave exactly as on a real machine.
+    """
+
+    def __init__(self, start: datetime, tz: Optional[tzinfo] = None) -> None:
+        if start.tzinfo is None:
+            raise ValueError("SimulatedClock requires a timezone-aware start time")
+        self.tz = tz or start.tzinfo
+        self._epoch = start.timestamp()
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self._epoch, self.tz)
+
+    def monotonic(self) -> float:
+        return self._epoch
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        if event.is_set():
+            return True
+        self.advance(timeout)
+        return event.is_set()
+
+    def advance(self, seconds: float | timedelta) -> None:
+        if isinstance(seconds, timedelta):
+            seconds = seconds.total_seconds()
+        self._epoch += max(0.0, seconds)
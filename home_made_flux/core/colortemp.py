@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+NEUTRAL_KELVIN = 6500  # Strength 0: identity ramp, no tint.
+WARMEST_KELVIN = 1900  # Strength 100.
+MIN_KELVIN = 1000
+MAX_KELVIN = 10000
+KELVIN_STEP = 50
+RAMP_SIZE = 256
+
+
+def strength_to_kelvin(strength: int) -> int:
+    """Map a 0-100 Night Light strength to a colour temperature in Kelvin."""
+    strength = max(0, min(100, strength))
+    return round(NEUTRAL_KELVIN - (NEUTRAL_KELVIN - WARMEST_KELVIN) * strength / 100)
+
+
+def quantize_kelvin(kelvin: float, step: int = KELVIN_STEP) -> int:
+    """Clamp and round a temperature to the cache granularity."""
+    kelvin = max(MIN_KELVIN, min(MAX_KELVIN, kelvin))
+    return int(round(kelvin / step) * step)
+
+
+def _blackbody_rgb(kelvin: float) -> tuple[float, float, float]:
+    # Tanner Helland's fit of the Planckian locus, in 0-255 channel units.
+    temp = kelvin / 100
+    if temp <= 66:
+        red = 255.0
+        green = 99.4708025861 * math.log(temp) - 161.1195681661
+    else:
+        red = 329.698727446 * (temp - 60) ** -0.1332047592
+        green = 288.1221695283 * (temp - 60) ** -0.0755148492
+    if temp >= 66:
+        blue = 255.0
+    elif temp <= 19:
+        blue = 0.0
+    else:
+        blue = 138.5177312231 * math.log(temp - 10) - 305.0447927307
+    return tuple(max(0.0, min(255.0, channel)) for channel in (red, green, blue))  # type: ignore[return-value]
+
+
+def kelvin_to_rgb(kelvin: float) -> tuple[float, float, float]:
+    """
+    Return per-channel multipliers (0-1) for a colour temperature.
+
+    Values are normalized against NEUTRAL_KELVIN so the neutral point maps to
+    exactly (1, 1, 1) and the display is left untouched.
+    """
+    rgb = _blackbody_rgb(kelvin)
+    neutral = _blackbody_rgb(NEUTRAL_KELVIN)
+    return tuple(min(1.0, channel / ref) for channel, ref in zip(rgb, neutral))  # type: ignore[return-value]
+
+
+def build_gamma_ramp(kelvin: float) -> np.ndarray:
+    """
+    Build a 3x256 uint16 gamma ramp for a colour temperature.
+
+    The layout matches the WORD[3][256] buffer expected by SetDeviceGammaRamp.
+    """
+    identity = np.arange(RAMP_SIZE, dtype=np.float64) * (65535 / (RAMP_SIZE - 1))
+    multipliers = np.asarray(kelvin_to_rgb(kelvin), dtype=np.float64)
+    ramp = np.rint(np.outer(multipliers, identity)).astype(np.uint16)
+    return ramp
+
+
+class GammaRampCache:
+    """
+    Caches gamma ramps per quantized temperature and precomputed transitions.
+
+    Ramps are returned read-only and shared between callers, so a transition
+    is just a tuple of references into the ramp cache.
+    """
+
+    def __init__(self, step: int = KELVIN_STEP, max_transitions: int = 16) -> None:
+        self.step = step
+        self.max_transitions = max_transitions
+        self._ramps: dict[int, np.ndarray] = {}
+        self._transitions: OrderedDict[tuple[int, int, int], tuple[np.ndarray, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kelvin: float) -> np.ndarray:
+        key = quantize_kelvin(kelvin, self.step)
+        ramp = self._ramps.get(key)
+        if ramp is None:
+            ramp = build_gamma_ramp(key)
+            ramp.setflags(write=False)
+            ramp = self._ramps.setdefault(key, ramp)
+        return ramp
+
+    def transition(self, start_kelvin: float, end_kelvin: float, steps: int) -> tuple[np.ndarray, ...]:
+        """
+        Return the ramps for a smooth transition, excluding the start point.
+
+        The last element is always the ramp for end_kelvin. Sequences are
+        memoized so repeated sunrise/sunset transitions cost nothing to plan.
+        """
+        steps = max(1, steps)
+        key = (quantize_kelvin(start_kelvin, self.step), quantize_kelvin(end_kelvin, self.step), steps)
+        with self._lock:
+            frames = self._transitions.get(key)
+            if frames is not None:
+                self._transitions.move_to_end(key)
+                return frames
+        kelvins = np.linspace(key[0], key[1], steps + 1)[1:]
+        frames = tuple(self.get(kelvin) for kelvin in kelvins)
+        with self._lock:
+            self._transitions[key] = frames
+            while len(self._transitions) > self.max_transitions:
+                self._transitions.popitem(last=False)
+        return frames
+
+    def __len__(self) -> int:
+        return len(self._ramps)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, fields
+from typing import Optional
+
+from home_made_flux.core.clock import Clock, SystemClock
+from home_made_flux.core.logic import FluxLogic
+from home_made_flux.core.scheduler import SchedulerResult
+from home_made_flux.services.geocoding import GeocodingService
+from home_made_flux.services.geolocation import GeolocationService, Location
+from home_made_flux.services.suntime import SunTimeService, SunTimes
+from home_made_flux.util.config import AppConfig
+from home_made_flux.windows.nightlight import NightLightController, NightLightState
+
+
+@dataclass
+class TickSettings:
+    """The AppConfig fields a tick reads; names must match AppConfig."""
+
+    location_mode: str = "auto"
+    manual_location: str = ""
+    night_light_strength: int = 50
+    transition_minutes: int = 10
+    dry_run: bool = True
+    manual_override: Optional[bool] = None
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> TickSettings:
+        return cls(**{f.name: getattr(config, f.name) for f in fields(cls)})
+
+
+class TickPipeline:
+    """
+    One scheduler tick: resolve location, fetch sun times, decide and apply.
+
+    Kept free of UI state so the replay harness can drive it with stubbed
+    services and a simulated clock.
+    """
+
+    def __init__(
+        self,
+        logic: FluxLogic,
+        geolocation: GeolocationService,
+        geocoding: GeocodingService,
+        suntime: SunTimeService,
+        nightlight: NightLightController,
+        logger: logging.Logger,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        self.logic = logic
+        self.geolocation = geolocation
+        self.geocoding = geocoding
+        self.suntime = suntime
+        self.nightlight = nightlight
+        self.logger = logger.getChild("pipeline")
+        self.clock = clock or SystemClock()
+
+        self.location: Optional[Location] = None
+        self.sun_times: Optional[SunTimes] = None
+
+    def _resolve_manual_location(self, text: str) -> Optional[Location]:
+        if "," in text:
+            try:
+                lat_str, lon_str = [piece.strip() for piece in text.split(",", maxsplit=1)]
+                return Location(latitude=float(lat_str), longitude=float(lon_str), city=None, country=None)
+            except ValueError:
+                return None
+        geo = self.geocoding.lookup(text)
+        if not geo:
+            return None
+        return Location(latitude=geo.latitude, longitude=geo.longitude, city=geo.display_name, country=None)
+
+    def resolve_location(self, settings: TickSettings) -> Location:
+        if settings.location_mode == "manual":
+            manual = self._resolve_manual_location(settings.manual_location)
+            if manual:
+                return manual
+        found = self.geolocation.fetch()
+        if found:
+            return found
+        self.logger.info("Falling back to default location (0,0)")
+        return Location(latitude=0.0, longitude=0.0, city="Unknown", country=None)
+
+    def fetch_sun_times(self, location: Location) -> SunTimes:
+        sun = self.suntime.fetch(location.latitude, location.longitude)
+        if sun:
+            return sun
+        return self.suntime.fallback()
+
+    def run(self, settings: TickSettings) -> SchedulerResult:
+        self.location = self.resolve_location(settings)
+        self.sun_times = self.fetch_sun_times(self.location)
+
+        now = self.clock.now()
+        decision = self.logic.decide(
+            now=now,
+            sunrise=self.sun_times.sunrise,
+            sunset=self.sun_times.sunset,
+            target_strength=settings.night_light_strength,
+            manual_override=settings.manual_override,
+        )
+        applied = self.nightlight.apply_state(
+            NightLightState(enabled=decision.should_enable, strength=decision.target_strength),
+            transition_minutes=settings.transition_minutes,
+            dry_run=settings.dry_run,
+        )
+        message = f"{decision.reason}; applied={applied}"
+        return SchedulerResult(decision=decision, applied=applied, timestamp=now, message=message)
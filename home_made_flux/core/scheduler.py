@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import threading
-import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Callable, Optional
 
+from home_made_flux.core.clock import Clock, SystemClock
 from home_made_flux.core.logic import ScheduleDecision
+from home_made_flux.util.profiling import TickProfiler
 
 
 @dataclass
@@ -22,7 +23,11 @@ class Scheduler:
     Periodically evaluates and applies Night Light state.
 
     The tick callable must return a SchedulerResult. An optional callback can
-    consume the result for UI updates.
+    consume the result for UI updates. An enabled TickProfiler wraps each
+    tick; when it is absent or disabled, ticks are called directly.
+    The interval can be changed while running via set_interval(), and wake()
+    runs the next tick early on the scheduler thread. Waiting goes through
+    the injected Clock, so a SimulatedClock replays days in moments.
     """
 
     def __init__(
@@ -30,11 +35,17 @@ class Scheduler:
         interval_minutes: int,
         tick: Callable[[], SchedulerResult],
         callback: Optional[Callable[[SchedulerResult], None]] = None,
+        profiler: Optional[TickProfiler] = None,
+        clock: Optional[Clock] = None,
     ) -> None:
         self.interval_minutes = interval_minutes
         self.tick = tick
         self.callback = callback
+        self.clock = clock or SystemClock()
+        self.profiler = profiler if profiler and profiler.enabled else None
         self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._tick_requested = False
         self._thread: Optional[threading.Thread] = None
 
     def start(self) -> None:
@@ -44,20 +55,58 @@ class Scheduler:
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
 
+    def run(self) -> None:
+        """Run the tick loop on the calling thread until stop() is called."""
+        self._stop_event.clear()
+        self._run()
+
     def _run(self) -> None:
+        if self.profiler:
+            self.profiler.thread_started()
+        try:
+            while not self._stop_event.is_set():
+                result = self.tick() if self.profiler is None else self.profiler.run(self.tick)
+                if self.callback:
+                    self.callback(result)
+                self._wait_for_next_tick(self.clock.monotonic())
+        finally:
+            if self.profiler:
+                self.profiler.thread_stopped()
+
+    def _wait_for_next_tick(self, last_tick: float) -> None:
         while not self._stop_event.is_set():
-            result = self.tick()
-            if self.callback:
-                self.callback(result)
-            time.sleep(max(self.interval_minutes * 60, 1))
+            # Re-read the interval on every wake so set_interval() applies to the current wait.
+            remaining = last_tick + max(self.interval_minutes * 60, 1) - self.clock.monotonic()
+            if remaining <= 0:
+                return
+            if self.clock.wait(self._wake_event, remaining):
+                self._wake_event.clear()
+                if self._tick_requested:
+                    self._tick_requested = False
+                    return
+
+    def set_interval(self, interval_minutes: int) -> None:
+        # Coerce and clamp so a bad value cannot kill the loop; 0 means the 1 second floor.
+        self.interval_minutes = max(0, int(interval_minutes))
+        self._wake_event.set()
+
+    def wake(self) -> None:
+        """Run the next tick now on the scheduler thread instead of waiting."""
+        self._tick_requested = True
+        self._wake_event.set()
 
     def stop(self) -> None:
         self._stop_event.set()
-        if self._thread:
+        self._wake_event.set()
+        # stop() may be called from a callback on the scheduler thread itself.
+        if self._thread and self._thread is not threading.current_thread():
             self._thread.join(timeout=2)
 
     def trigger_once(self) -> SchedulerResult:
-        result = self.tick()
+        if self.profiler is None:
+            result = self.tick()
+        else:
+            result = self.profiler.run(self.tick, label="trigger")
         if self.callback:
             self.callback(result)
         return result
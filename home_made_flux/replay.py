@@ -0,0 +1,225 @@
+"""
+Fast-forward replay of the scheduler and tick pipeline through virtual time.
+
+The real Scheduler, TickPipeline, FluxLogic and (dry-run) NightLightController
+run against a SimulatedClock and stubbed network services, so months of
+ticks complete in seconds. Usage:
+
+    python -m home_made_flux.replay --start 2024-01-01 --days 365 --tz Europe/Berlin
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass, field, replace
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional, Sequence, TextIO
+from zoneinfo import ZoneInfo
+
+from home_made_flux.core.clock import Clock, SimulatedClock
+from home_made_flux.core.logic import FluxLogic
+from home_made_flux.core.pipeline import TickPipeline, TickSettings
+from home_made_flux.core.scheduler import Scheduler, SchedulerResult
+from home_made_flux.services.geocoding import GeoResult
+from home_made_flux.services.geolocation import Location
+from home_made_flux.services.suntime import SunTimes, SunTimeService
+from home_made_flux.util.config import AppConfig, read_config, update_config
+from home_made_flux.windows.nightlight import NightLightController
+
+
+class FixedGeolocationService:
+    """Stands in for GeolocationService; always reports the same location."""
+
+    def __init__(self, location: Location) -> None:
+        self.location = location
+
+    def fetch(self) -> Optional[Location]:
+        return self.location
+
+
+class NullGeocodingService:
+    def lookup(self, query: str) -> Optional[GeoResult]:
+        return None
+
+
+class NullGammaBackend:
+    """Never touches the display; a second guard behind the forced dry run."""
+
+    def apply(self, ramp: Any) -> bool:
+        return False
+
+
+class RecordedSunTimeService(SunTimeService):
+    """
+    Serves recorded sunrise-sunset API results keyed by ISO date.
+
+    Days without a recording return None, so the pipeline uses the regular
+    fallback() times, evaluated on the simulated clock.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        clock: Clock,
+        responses: Optional[dict[str, dict[str, Any]]] = None,
+    ) -> None:
+        super().__init__(logger, clock=clock)
+        self.responses = responses or {}
+
+    def fetch(self, latitude: float, longitude: float) -> Optional[SunTimes]:
+        results = self.responses.get(self.clock.now().date().isoformat())
+        if not results:
+            return None
+        return self._to_local(results)
+
+
+@dataclass
+class Transition:
+    timestamp: datetime
+    enabled: bool
+    strength: int
+    reason: str
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["timestamp"] = self.timestamp.isoformat()
+        return json.dumps(data)
+
+
+@dataclass
+class ReplayReport:
+    start: datetime
+    end: datetime
+    ticks: int = 0
+    wall_seconds: float = 0.0
+    transitions: list[Transition] = field(default_factory=list)
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.wall_seconds if self.wall_seconds else float("inf")
+
+    def write_jsonl(self, stream: TextIO) -> None:
+        for transition in self.transitions:
+            stream.write(transition.to_json() + "\n")
+
+
+def replay(
+    start: datetime,
+    end: datetime,
+    settings: Optional[TickSettings] = None,
+    interval_minutes: int = 5,
+    location: Optional[Location] = None,
+    sun_responses: Optional[dict[str, dict[str, Any]]] = None,
+    logger: Optional[logging.Logger] = None,
+) -> ReplayReport:
+    """
+    Drive the scheduler from start until end on a simulated clock.
+
+    The first tick's state and every later change of on/off or strength are
+    recorded as transitions, stamped with the virtual tick time. dry_run is
+    always forced on, whatever the settings say: a replay must never change
+    the real display or start real-time transition threads.
+    """
+    settings = replace(settings or TickSettings(), dry_run=True)
+    logger = logger or logging.getLogger("home_made_flux.replay")
+    clock = SimulatedClock(start)
+    pipeline = TickPipeline(
+        logic=FluxLogic(transition_minutes=settings.transition_minutes),
+        geolocation=FixedGeolocationService(location or Location(latitude=0.0, longitude=0.0)),  # type: ignore[arg-type]
+        geocoding=NullGeocodingService(),  # type: ignore[arg-type]
+        suntime=RecordedSunTimeService(logger, clock, sun_responses),
+        nightlight=NightLightController(logger, backend=NullGammaBackend()),  # type: ignore[arg-type]
+        logger=logger,
+        clock=clock,
+    )
+    report = ReplayReport(start=start, end=end)
+
+    def record(result: SchedulerResult) -> None:
+        if result.timestamp >= end:
+            scheduler.stop()
+            return
+        report.ticks += 1
+        decision = result.decision
+        last = report.transitions[-1] if report.transitions else None
+        if last is None or (last.enabled, last.strength) != (decision.should_enable, decision.target_strength):
+            report.transitions.append(
+                Transition(
+                    timestamp=result.timestamp,
+                    enabled=decision.should_enable,
+                    strength=decision.target_strength,
+                    reason=decision.reason,
+                )
+            )
+
+    scheduler = Scheduler(
+        interval_minutes=interval_minutes,
+        tick=lambda: pipeline.run(settings),
+        callback=record,
+        clock=clock,
+    )
+    started = time.perf_counter()
+    scheduler.run()
+    report.wall_seconds = time.perf_counter() - started
+    return report
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="home_made_flux.replay")
+    parser.add_argument("--start", type=date.fromisoformat, default=date.today(), help="first day (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=30, help="number of days to replay")
+    parser.add_argument("--tz", default="UTC", help="IANA timezone, e.g. Europe/Berlin")
+    parser.add_argument("--interval", type=int, default=5, help="scheduler interval in minutes")
+    parser.add_argument("--config", type=Path, help="replay with the tick settings from this config.json")
+    parser.add_argument("--strength", type=int, help="override night_light_strength")
+    parser.add_argument("--lat", type=float, default=0.0)
+    parser.add_argument("--lon", type=float, default=0.0)
+    parser.add_argument(
+        "--sun-responses",
+        type=Path,
+        help="JSON object mapping YYYY-MM-DD to recorded sunrise-sunset API results",
+    )
+    parser.add_argument("--output", type=Path, help="write the transition log as JSON lines (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    tz = ZoneInfo(args.tz)
+    start = datetime.combine(args.start, datetime.min.time(), tzinfo=tz)
+    end = start + timedelta(days=args.days)
+    responses = None
+    if args.sun_responses:
+        responses = json.loads(args.sun_responses.read_text(encoding="utf-8"))
+    config = read_config(args.config) if args.config else AppConfig()
+    if args.strength is not None:
+        config = update_config(config, {"night_light_strength": args.strength})
+
+    report = replay(
+        start=start,
+        end=end,
+        settings=TickSettings.from_config(config),
+        interval_minutes=args.interval,
+        location=Location(latitude=args.lat, longitude=args.lon),
+        sun_responses=responses,
+    )
+    if args.output:
+        with args.output.open("w", encoding="utf-8") as f:
+            report.write_jsonl(f)
+    else:
+        report.write_jsonl(sys.stdout)
+    print(
+        f"{report.ticks} ticks, {len(report.transitions)} transitions in "
+        f"{report.wall_seconds:.2f}s ({report.ticks_per_second:,.0f} ticks/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
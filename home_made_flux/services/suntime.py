@@ -3,10 +3,12 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Optional
 
 import requests
 
+from home_made_flux.core.clock import Clock, SystemClock
+
 
 SUN_API_URL = "https://api.sunrise-sunset.org/json"
 
@@ -18,11 +20,13 @@ class SunTimes:
 
 
 class SunTimeService:
-    def __init__(self, logger: logging.Logger) -> None:
+    def __init__(self, logger: logging.Logger, clock: Optional[Clock] = None) -> None:
         self.logger = logger.getChild("suntime")
+        self.clock = clock or SystemClock()
 
     def fetch(self, latitude: float, longitude: float) -> Optional[SunTimes]:
-        params = {"lat": latitude, "lng": longitude, "formatted": 0}
+        today = self.clock.now().date().isoformat()
+        params = {"lat": latitude, "lng": longitude, "date": today, "formatted": 0}
         try:
             response = requests.get(SUN_API_URL, params=params, timeout=8)
             if response.status_code != 200:
@@ -33,20 +37,21 @@ class SunTimeService:
             if not results:
                 self.logger.warning("Sun time API returned no results")
                 return None
-            sunrise = datetime.fromisoformat(results["sunrise"])
-            sunset = datetime.fromisoformat(results["sunset"])
-            # Convert to local time for comparison.
-            local_tz = datetime.now().astimezone().tzinfo or timezone.utc
-            sunrise_local = sunrise.astimezone(local_tz)
-            sunset_local = sunset.astimezone(local_tz)
-            return SunTimes(sunrise=sunrise_local, sunset=sunset_local)
+            return self._to_local(results)
         except Exception as exc:
             self.logger.warning("Sun time lookup error: %s", exc)
             return None
 
+    def _to_local(self, results: dict[str, Any]) -> SunTimes:
+        sunrise = datetime.fromisoformat(results["sunrise"])
+        sunset = datetime.fromisoformat(results["sunset"])
+        # Convert to local time for comparison.
+        local_tz = self.clock.now().tzinfo or timezone.utc
+        return SunTimes(sunrise=sunrise.astimezone(local_tz), sunset=sunset.astimezone(local_tz))
+
     def fallback(self) -> SunTimes:
         """Return a sensible default if network is unavailable."""
-        now = datetime.now().astimezone()
+        now = self.clock.now()
         sunrise = now.replace(hour=7, minute=0, second=0, microsecond=0)
         sunset = now.replace(hour=19, minute=0, second=0, microsecond=0)
         if sunrise > sunset:
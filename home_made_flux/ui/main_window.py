@@ -3,18 +3,30 @@ from __future__ import annotations
 import logging
 import queue
 import tkinter as tk
-from dataclasses import asdict
-from datetime import datetime
+from dataclasses import asdict, fields
 from tkinter import messagebox, ttk
 from typing import Optional
 
 from home_made_flux.core.logic import FluxLogic, ScheduleDecision
+from home_made_flux.core.pipeline import TickPipeline, TickSettings
 from home_made_flux.core.scheduler import Scheduler, SchedulerResult
 from home_made_flux.services.geocoding import GeocodingService
 from home_made_flux.services.geolocation import GeolocationService, Location
 from home_made_flux.services.suntime import SunTimeService, SunTimes
-from home_made_flux.util.config import AppConfig, save_config, update_config
-from home_made_flux.windows.nightlight import NightLightController, NightLightState
+from home_made_flux.util.config import (
+    AppConfig,
+    ConfigWatcher,
+    DebouncedSaver,
+    changed_fields,
+    update_config,
+)
+from home_made_flux.util.profiling import TickProfiler
+from home_made_flux.windows.nightlight import NightLightController
+
+
+CONFIG_POLL_MS = 2000
+# Settings that change what the controller should apply; a live edit re-runs the tick.
+NIGHTLIGHT_FIELDS = {f.name for f in fields(TickSettings)}
 
 
 class MainWindow:
@@ -27,6 +39,7 @@ class MainWindow:
         suntime: SunTimeService,
         nightlight: NightLightController,
         logger: logging.Logger,
+        profiler: Optional[TickProfiler] = None,
     ) -> None:
         self.root = root
         self.config = config
@@ -36,19 +49,31 @@ class MainWindow:
         self.nightlight = nightlight
         self.logger = logger.getChild("ui")
         self.logic = FluxLogic(transition_minutes=config.transition_minutes)
+        self.pipeline = TickPipeline(
+            logic=self.logic,
+            geolocation=geolocation,
+            geocoding=geocoding,
+            suntime=suntime,
+            nightlight=nightlight,
+            logger=logger,
+        )
         self.status_queue: queue.Queue[SchedulerResult] = queue.Queue()
 
         self.location: Optional[Location] = None
         self.sun_times: Optional[SunTimes] = None
+        self.config_watcher = ConfigWatcher()
+        self.config_saver = DebouncedSaver(on_saved=self._on_config_saved)
 
         self._build_ui()
         self.scheduler = Scheduler(
             interval_minutes=self.config.schedule_interval_minutes,
             tick=self._tick,
             callback=self.status_queue.put,
+            profiler=profiler,
         )
         self.scheduler.start()
         self.root.after(1000, self._process_queue)
+        self.root.after(CONFIG_POLL_MS, self._poll_config)
 
     def _build_ui(self) -> None:
         self.root.title("home made flux")
@@ -60,11 +85,7 @@ class MainWindow:
         self.transition_var = tk.IntVar(value=self.config.transition_minutes)
         self.start_login_var = tk.BooleanVar(value=self.config.start_at_login)
         self.dry_run_var = tk.BooleanVar(value=self.config.dry_run)
-        self.override_var = tk.StringVar(
-            value="auto"
-            if self.config.manual_override is None
-            else ("on" if self.config.manual_override else "off")
-        )
+        self.override_var = tk.StringVar(value=self._format_override(self.config.manual_override))
 
         frame = ttk.Frame(self.root, padding=16)
         frame.pack(fill=tk.BOTH, expand=True)
@@ -150,6 +171,12 @@ class MainWindow:
 
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
+    @staticmethod
+    def _format_override(value: Optional[bool]) -> str:
+        if value is None:
+            return "auto"
+        return "on" if value else "off"
+
     def _parse_override(self) -> Optional[bool]:
         value = self.override_var.get()
         if value == "on":
@@ -158,58 +185,23 @@ class MainWindow:
             return False
         return None
 
-    def _resolve_manual_location(self, text: str) -> Optional[Location]:
-        if "," in text:
-            try:
-                lat_str, lon_str = [piece.strip() for piece in text.split(",", maxsplit=1)]
-                return Location(latitude=float(lat_str), longitude=float(lon_str), city=None, country=None)
-            except ValueError:
-                return None
-        geo = self.geocoding.lookup(text)
-        if not geo:
-            return None
-        return Location(latitude=geo.latitude, longitude=geo.longitude, city=geo.display_name, country=None)
-
-    def _resolve_location(self) -> Location:
-        if self.location_mode.get() == "manual":
-            manual = self._resolve_manual_location(self.manual_location_var.get())
-            if manual:
-                return manual
-        found = self.geolocation.fetch()
-        if found:
-            return found
-        self.logger.info("Falling back to default location (0,0)")
-        return Location(latitude=0.0, longitude=0.0, city="Unknown", country=None)
-
-    def _fetch_sun_times(self, location: Location) -> SunTimes:
-        sun = self.suntime.fetch(location.latitude, location.longitude)
-        if sun:
-            return sun
-        return self.suntime.fallback()
-
     def _tick(self) -> SchedulerResult:
-        self.location = self._resolve_location()
-        self.sun_times = self._fetch_sun_times(self.location)
-
-        now = datetime.now().astimezone()
         manual_override = self._parse_override()
-        decision = self.logic.decide(
-            now=now,
-            sunrise=self.sun_times.sunrise,
-            sunset=self.sun_times.sunset,
-            target_strength=int(self.strength_var.get()),
-            manual_override=manual_override,
-        )
-        applied = self.nightlight.apply_state(
-            NightLightState(enabled=decision.should_enable, strength=decision.target_strength),
+        settings = TickSettings(
+            location_mode=self.location_mode.get(),
+            manual_location=self.manual_location_var.get(),
+            night_light_strength=int(self.strength_var.get()),
             transition_minutes=int(self.transition_var.get()),
             dry_run=self.dry_run_var.get(),
+            manual_override=manual_override,
         )
+        result = self.pipeline.run(settings)
+        self.location = self.pipeline.location
+        self.sun_times = self.pipeline.sun_times
         # Reset override after single use.
         if manual_override is not None:
             self.override_var.set("auto")
-        message = f"{decision.reason}; applied={applied}"
-        return SchedulerResult(decision=decision, applied=applied, timestamp=now, message=message)
+        return result
 
     def _process_queue(self) -> None:
         while not self.status_queue.empty():
@@ -232,6 +224,40 @@ class MainWindow:
         self.location_label.config(text=f"Location: {location_text}")
         self.logger.info("Scheduler tick: %s", result.message)
 
+    def _poll_config(self) -> None:
+        updated = self.config_watcher.poll()
+        if updated is not None:
+            self._apply_config(updated)
+        self.root.after(CONFIG_POLL_MS, self._poll_config)
+
+    def _apply_config(self, updated: AppConfig) -> None:
+        """Apply an externally edited config, touching only components whose fields changed."""
+        changed = changed_fields(self.config, updated)
+        if not changed:
+            return
+        self.logger.info("config.json changed on disk: %s", ", ".join(sorted(changed)))
+        self.config = updated
+        ui_vars: dict[str, tk.Variable] = {
+            "location_mode": self.location_mode,
+            "manual_location": self.manual_location_var,
+            "night_light_strength": self.strength_var,
+            "transition_minutes": self.transition_var,
+            "start_at_login": self.start_login_var,
+            "dry_run": self.dry_run_var,
+        }
+        for name in changed & ui_vars.keys():
+            ui_vars[name].set(getattr(updated, name))
+        if "manual_override" in changed:
+            self.override_var.set(self._format_override(updated.manual_override))
+        if "transition_minutes" in changed:
+            self.logic.transition_minutes = updated.transition_minutes
+        if "schedule_interval_minutes" in changed:
+            self.scheduler.set_interval(updated.schedule_interval_minutes)
+        if changed & NIGHTLIGHT_FIELDS:
+            self.scheduler.wake()
+        if changed & {"profile_every_n_ticks", "profile_slow_tick_ms", "profile_memory"}:
+            self.logger.info("Profiling settings take effect on next start")
+
     def apply_now(self) -> None:
         result = self.scheduler.trigger_once()
         messagebox.showinfo(
@@ -251,10 +277,20 @@ class MainWindow:
             "dry_run": self.dry_run_var.get(),
         }
         self.config = update_config(self.config, updates)
-        save_config(self.config)
-        messagebox.showinfo("Settings", "Settings saved to config.json")
-        self.logger.info("Settings saved: %s", asdict(self.config))
+        self.config_saver.save(self.config)
+        messagebox.showinfo("Settings", "Settings will be written to config.json shortly")
+        self.logger.info("Settings queued for saving: %s", asdict(self.config))
+
+    def _on_config_saved(self, ok: bool) -> None:
+        # Runs on the saver's timer thread; only logging and a stat() happen here.
+        if ok:
+            self.config_watcher.mark_current()
+            self.logger.info("Settings written to %s", self.config_saver.path)
+        else:
+            self.logger.warning("Could not write settings to %s", self.config_saver.path)
 
     def _on_close(self) -> None:
+        self.config_saver.flush()
         self.scheduler.stop()
+        self.nightlight.reset()
         self.root.destroy()
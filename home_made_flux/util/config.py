@@ -1,7 +1,14 @@
+from __future__ import annotations
+
 import json
-from dataclasses import dataclass, asdict
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass, asdict, fields
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Optional, get_args, get_type_hints
 
 
 DEFAULT_CONFIG_PATH = Path("config.json")
@@ -17,31 +24,218 @@ class AppConfig:
     dry_run: bool = True
     start_at_login: bool = False
     manual_override: bool | None = None  # None means follow schedule
+    profile_every_n_ticks: int = 0  # 0 disables periodic tick profiling
+    profile_slow_tick_ms: int = 0  # 0 disables slow-tick profiling
+    profile_memory: bool = False
+
+
+# Inclusive bounds for numeric fields; values outside are rejected, not clamped.
+FIELD_RANGES: dict[str, tuple[int, int]] = {
+    "night_light_strength": (0, 100),
+    "transition_minutes": (0, 60),
+    "schedule_interval_minutes": (1, 24 * 60),
+    "profile_every_n_ticks": (0, 1_000_000),
+    "profile_slow_tick_ms": (0, 3_600_000),
+}
+LOCATION_MODES = {"auto", "manual"}
+
+
+def _check_field(name: str, value: Any, hint: Any) -> None:
+    """Raise TypeError/ValueError if value is not acceptable for the AppConfig field."""
+    allowed = get_args(hint) or (hint,)
+    # bool is an int subclass; don't let true/false pass for numeric fields.
+    if not isinstance(value, allowed) or (isinstance(value, bool) and bool not in allowed):
+        raise TypeError(f"{name}: expected {hint}, got {type(value).__name__}")
+    if name in FIELD_RANGES:
+        low, high = FIELD_RANGES[name]
+        if not low <= value <= high:
+            raise ValueError(f"{name}: {value} outside {low}-{high}")
+    if name == "location_mode" and value not in LOCATION_MODES:
+        raise ValueError(f"location_mode: {value!r} not in {sorted(LOCATION_MODES)}")
+
+
+def validate_config(raw: Any) -> AppConfig:
+    """
+    Build an AppConfig from parsed JSON, checking every value.
 
+    Raises TypeError for unknown keys or values whose type does not match the
+    AppConfig field, and ValueError for out-of-range values.
+    """
+    if not isinstance(raw, dict):
+        raise TypeError("config must be a JSON object")
+    hints = get_type_hints(AppConfig)
+    for name, value in raw.items():
+        if name not in hints:
+            raise TypeError(f"unknown config key: {name}")
+        _check_field(name, value, hints[name])
+    return AppConfig(**raw)
 
-def load_config(path: str | Path = DEFAULT_CONFIG_PATH) -> AppConfig:
+
+def read_config(path: str | Path = DEFAULT_CONFIG_PATH) -> AppConfig:
+    """Read config.json, raising on a missing, unreadable, malformed or invalid file."""
+    with Path(path).open("r", encoding="utf-8") as f:
+        raw = json.load(f)
+    return validate_config(raw)
+
+
+def load_config(
+    path: str | Path = DEFAULT_CONFIG_PATH, logger: Optional[logging.Logger] = None
+) -> AppConfig:
+    """
+    Load config.json for startup, keeping every valid setting.
+
+    Unlike read_config, an invalid or unknown key only resets that one
+    field to its default (with a warning), so a single bad hand edit does
+    not discard the rest of the user's settings.
+    """
+    logger = logger or logging.getLogger("home_made_flux.config")
     config_path = Path(path)
     if not config_path.exists():
         return AppConfig()
     try:
         with config_path.open("r", encoding="utf-8") as f:
             raw = json.load(f)
-        return AppConfig(**raw)
-    except (json.JSONDecodeError, TypeError, OSError):
+    except (ValueError, OSError) as exc:
+        logger.warning("Could not read %s, using defaults: %s", config_path, exc)
         return AppConfig()
+    if not isinstance(raw, dict):
+        logger.warning("%s is not a JSON object, using defaults", config_path)
+        return AppConfig()
+    hints = get_type_hints(AppConfig)
+    valid: dict[str, Any] = {}
+    for name, value in raw.items():
+        if name not in hints:
+            logger.warning("Ignoring unknown config key %r in %s", name, config_path)
+            continue
+        try:
+            _check_field(name, value, hints[name])
+        except (TypeError, ValueError) as exc:
+            logger.warning("Ignoring invalid setting in %s, using default: %s", config_path, exc)
+            continue
+        valid[name] = value
+    return AppConfig(**valid)
+
 
+def save_config(config: AppConfig, path: str | Path = DEFAULT_CONFIG_PATH) -> bool:
+    """
+    Persist config atomically; returns False if it could not be written.
 
-def save_config(config: AppConfig, path: str | Path = DEFAULT_CONFIG_PATH) -> None:
+    The JSON is written to a temp file in the same directory, fsynced and
+    renamed over the target, so readers never observe a half-written file.
+    """
     config_path = Path(path)
+    tmp_name: Optional[str] = None
     try:
-        with config_path.open("w", encoding="utf-8") as f:
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=f".{config_path.name}.", suffix=".tmp", dir=config_path.parent
+        )
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
             json.dump(asdict(config), f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        if config_path.exists():
+            shutil.copymode(config_path, tmp_name)
+        os.replace(tmp_name, config_path)
+        tmp_name = None
+        return True
     except OSError:
         # Best-effort persistence; logging handled by caller.
-        return
+        return False
+    finally:
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
 
 
 def update_config(config: AppConfig, updates: dict[str, Any]) -> AppConfig:
     data = asdict(config)
     data.update(updates)
     return AppConfig(**data)
+
+
+def changed_fields(old: AppConfig, new: AppConfig) -> set[str]:
+    return {f.name for f in fields(AppConfig) if getattr(old, f.name) != getattr(new, f.name)}
+
+
+class DebouncedSaver:
+    """
+    Coalesces bursts of saves into a single atomic write after `delay` seconds.
+
+    Only the most recent config is written. Call flush() before exiting so a
+    pending save is not lost. on_saved receives save_config's result and may
+    run on the timer thread.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_CONFIG_PATH,
+        delay: float = 0.5,
+        on_saved: Optional[Callable[[bool], None]] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.delay = delay
+        self.on_saved = on_saved
+        self._pending: Optional[AppConfig] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def save(self, config: AppConfig) -> None:
+        with self._lock:
+            self._pending = config
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            config, self._pending = self._pending, None
+            if config is None:
+                return
+            ok = save_config(config, self.path)
+        if self.on_saved:
+            self.on_saved(ok)
+
+
+class ConfigWatcher:
+    """
+    Detects external edits to config.json with a single stat() per poll.
+
+    A change in mtime, inode or size marks the file as modified; atomic
+    renames always change the inode. Files that fail to parse (e.g. an
+    editor mid-save) or hold wrong-typed or out-of-range values are skipped
+    until the next modification.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_CONFIG_PATH) -> None:
+        self.path = Path(path)
+        self._signature = self._stat()
+
+    def _stat(self) -> Optional[tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+    def mark_current(self) -> None:
+        """Accept the file as it is now, e.g. after the app saved it itself."""
+        self._signature = self._stat()
+
+    def poll(self) -> Optional[AppConfig]:
+        signature = self._stat()
+        if signature == self._signature:
+            return None
+        self._signature = signature
+        if signature is None:
+            return None
+        try:
+            return read_config(self.path)
+        except (ValueError, TypeError, OSError):
+            return None
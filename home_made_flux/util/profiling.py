@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import cProfile
+import itertools
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+DEFAULT_PROFILE_DIR = Path("logs") / "profiles"
+
+
+class TickProfiler:
+    """
+    Opt-in cProfile/tracemalloc capture for scheduler ticks.
+
+    Stats are written for every Nth call of each label (scheduled "tick" and
+    manual "trigger" are counted separately) and for any call slower than the
+    latency threshold. tracemalloc is process-wide, so memory snapshots cover
+    allocations from every thread, not just the scheduler's. Only the newest
+    max_files outputs of each kind and label are kept. When nothing is
+    enabled, callers should skip the profiler entirely.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | os.PathLike = DEFAULT_PROFILE_DIR,
+        every_n_ticks: int = 0,
+        slow_tick_ms: int = 0,
+        trace_memory: bool = False,
+        max_files: int = 20,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.output_dir = Path(output_dir)
+        self.every_n_ticks = max(0, every_n_ticks)
+        self.slow_tick_ms = max(0, slow_tick_ms)
+        self.trace_memory = trace_memory
+        self.max_files = max(1, max_files)
+        self.logger = (logger or logging.getLogger("home_made_flux")).getChild("profiling")
+        self._counters: dict[str, Iterator[int]] = {}
+        self._counters_lock = threading.Lock()
+        # Python 3.12+ allows one active cProfile per process (3.11 profiles per thread).
+        # Holding this around every profiled call keeps both versions safe; a tick that
+        # finds it busy runs unprofiled.
+        self._lock = threading.Lock()
+        # Serializes writes and rotation between the scheduler and UI threads.
+        self._output_lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.every_n_ticks or self.slow_tick_ms or self.trace_memory)
+
+    def thread_started(self) -> None:
+        """Begin (process-wide) memory tracing; called when the scheduler thread starts."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def thread_stopped(self) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def run(self, func: Callable[[], T], label: str = "tick") -> T:
+        """Call func, writing profile output if this call is selected."""
+        with self._counters_lock:
+            counter = self._counters.setdefault(label, itertools.count(1))
+        seq = next(counter)
+        sampled = bool(self.every_n_ticks) and seq % self.every_n_ticks == 0
+        if not (sampled or self.slow_tick_ms) or not self._lock.acquire(blocking=False):
+            return self._run_plain(func, label, seq, sampled)
+
+        profile = cProfile.Profile()
+        try:
+            started = time.perf_counter()
+            if not self._enable(profile):
+                return self._run_plain(func, label, seq, sampled)
+            try:
+                result = func()
+            finally:
+                profile.disable()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        finally:
+            self._lock.release()
+        slow = bool(self.slow_tick_ms) and elapsed_ms >= self.slow_tick_ms
+        if sampled or slow:
+            with self._output_lock:
+                self._write_stats(profile, label, seq, elapsed_ms, slow)
+                self._write_snapshot(label, seq)
+        return result
+
+    def _enable(self, profile: cProfile.Profile) -> bool:
+        try:
+            profile.enable()
+        except ValueError as exc:
+            # 3.12+: a debugger, coverage or another profiler already owns the hooks.
+            self.logger.warning("Profiling unavailable: %s", exc)
+            return False
+        return True
+
+    def profile_call(self, func: Callable[[], T], path: str | os.PathLike) -> T:
+        """
+        Run func once under cProfile and dump the stats to path (used for startup).
+
+        Holds the same lock as tick profiling, so a tick starting meanwhile
+        (e.g. the scheduler launched during startup) runs unprofiled instead
+        of failing to enable a second profiler.
+        """
+        profile = cProfile.Profile()
+        with self._lock:
+            if not self._enable(profile):
+                return func()
+            try:
+                return func()
+            finally:
+                profile.disable()
+                try:
+                    Path(path).parent.mkdir(parents=True, exist_ok=True)
+                    profile.dump_stats(path)
+                except OSError as exc:
+                    self.logger.warning("Could not write profile %s: %s", path, exc)
+
+    def _run_plain(self, func: Callable[[], T], label: str, seq: int, sampled: bool) -> T:
+        result = func()
+        if sampled or (self.trace_memory and not self.every_n_ticks and not self.slow_tick_ms):
+            with self._output_lock:
+                self._write_snapshot(label, seq)
+        return result
+
+    def _write_stats(
+        self, profile: cProfile.Profile, label: str, seq: int, elapsed_ms: float, slow: bool
+    ) -> None:
+        suffix = "-slow" if slow else ""
+        path = self.output_dir / f"{label}-{seq:06d}-{elapsed_ms:.0f}ms{suffix}.prof"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(path)
+        except OSError as exc:
+            self.logger.warning("Could not write profile %s: %s", path, exc)
+            return
+        self.logger.info("%s %s took %.1f ms; profile written to %s", label, seq, elapsed_ms, path)
+        self._rotate(f"{label}-*.prof")
+
+    def _write_snapshot(self, label: str, seq: int) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        path = self.output_dir / f"{label}-{seq:06d}.tracemalloc"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            tracemalloc.take_snapshot().dump(str(path))
+        except OSError as exc:
+            self.logger.warning("Could not write memory snapshot %s: %s", path, exc)
+            return
+        self._rotate(f"{label}-*.tracemalloc")
+
+    def _rotate(self, pattern: str) -> None:
+        # Only this label's outputs are matched, so e.g. startup.prof is never rotated away.
+        files = []
+        for path in self.output_dir.glob(pattern):
+            try:
+                files.append((path.stat().st_mtime_ns, path.name, path))
+            except OSError:
+                continue  # Removed by someone else in the meantime.
+        files.sort()
+        for _, _, stale in files[: -self.max_files]:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
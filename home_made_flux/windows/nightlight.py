@@ -2,7 +2,16 @@ from __future__ import annotations
 
 import logging
 import platform
+import threading
 from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from home_made_flux.core.colortemp import NEUTRAL_KELVIN, GammaRampCache, strength_to_kelvin
+
+
+TRANSITION_STEPS_PER_MINUTE = 30
 
 
 @dataclass
@@ -10,6 +19,56 @@ class NightLightState:
     enabled: bool
     strength: int
 
+    @property
+    def kelvin(self) -> int:
+        """Target colour temperature; neutral when Night Light is off."""
+        if not self.enabled:
+            return NEUTRAL_KELVIN
+        return strength_to_kelvin(self.strength)
+
+
+class GammaRampBackend:
+    """Applies gamma ramps to the primary display through GDI (Windows only)."""
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self.logger = logger.getChild("gamma")
+        self._gdi: Optional[tuple[Any, Any, Any]] = None
+
+    def _functions(self) -> tuple[Any, Any, Any]:
+        if self._gdi is None:
+            import ctypes  # Deferred: WinDLL only exists on Windows.
+            from ctypes import wintypes
+
+            # Private WinDLL instances so our prototypes don't leak into ctypes.windll.
+            user32 = ctypes.WinDLL("user32")  # type: ignore[attr-defined]
+            gdi32 = ctypes.WinDLL("gdi32")  # type: ignore[attr-defined]
+            get_dc = user32.GetDC
+            get_dc.argtypes = [wintypes.HWND]
+            get_dc.restype = wintypes.HDC
+            release_dc = user32.ReleaseDC
+            release_dc.argtypes = [wintypes.HWND, wintypes.HDC]
+            release_dc.restype = ctypes.c_int
+            set_ramp = gdi32.SetDeviceGammaRamp
+            set_ramp.argtypes = [wintypes.HDC, ctypes.c_void_p]
+            set_ramp.restype = wintypes.BOOL
+            self._gdi = (get_dc, release_dc, set_ramp)
+        return self._gdi
+
+    def apply(self, ramp: np.ndarray) -> bool:
+        get_dc, release_dc, set_ramp = self._functions()
+        buffer = np.ascontiguousarray(ramp, dtype=np.uint16)
+        hdc = get_dc(None)
+        if not hdc:
+            self.logger.warning("GetDC failed; cannot apply gamma ramp")
+            return False
+        try:
+            ok = set_ramp(hdc, buffer.ctypes.data)
+        finally:
+            release_dc(None, hdc)
+        if not ok:
+            self.logger.warning("SetDeviceGammaRamp rejected the ramp")
+        return bool(ok)
+
 
 class NightLightController:
     """
@@ -17,12 +76,28 @@ class NightLightController:
 
     This baseline implementation prioritizes safety: when not running on
     Windows or when dry_run is True, it will log intended actions without
-    modifying system settings.
+    modifying system settings. Otherwise the target state is applied as a
+    gamma ramp, stepping through precomputed tables for smooth transitions.
     """
 
-    def __init__(self, logger: logging.Logger) -> None:
+    def __init__(
+        self,
+        logger: logging.Logger,
+        ramp_cache: Optional[GammaRampCache] = None,
+        backend: Optional[GammaRampBackend] = None,
+    ) -> None:
         self.logger = logger.getChild("nightlight")
         self.is_windows = platform.system().lower() == "windows"
+        self.ramp_cache = ramp_cache or GammaRampCache()
+        self.backend = backend or GammaRampBackend(self.logger)
+        self.current_kelvin = NEUTRAL_KELVIN
+        self._transition_stop = threading.Event()
+        self._transition_thread: Optional[threading.Thread] = None
+        self._transition_target = NEUTRAL_KELVIN
+        self._touched_display = False
+        self._closed = False
+        # Scheduler ticks and "Apply now" on the Tk thread may call in concurrently.
+        self._lock = threading.RLock()
 
     def apply_state(
         self, state: NightLightState, transition_minutes: int, dry_run: bool = True
@@ -32,23 +107,112 @@ class NightLightController:
 
         Returns True if the operation was executed or safely simulated.
         """
+        with self._lock:
+            return self._apply_state_locked(state, transition_minutes, dry_run)
+
+    def _apply_state_locked(self, state: NightLightState, transition_minutes: int, dry_run: bool) -> bool:
         strength = max(0, min(100, state.strength))
+        target = NightLightState(enabled=state.enabled, strength=strength).kelvin
         if dry_run or not self.is_windows:
             self.logger.info(
-                "[Dry run] Would set Night Light to %s at strength %s (transition %s min)",
+                "[Dry run] Would set Night Light to %s at strength %s (%sK, transition %s min)",
                 "ON" if state.enabled else "OFF",
                 strength,
+                target,
                 transition_minutes,
             )
+            # Dry run switched on after real applies: don't leave the screen tinted.
+            if self._transition_thread:
+                self._cancel_transition()
+            if self._touched_display:
+                self._restore_neutral()
             return True
 
-        # Placeholder for real Windows integration. Keeping it safe for now.
-        self.logger.warning(
-            "Attempting to set Night Light to %s at strength %s (transition %s min). "
-            "Direct system changes are not implemented in this baseline.",
+        if self._closed:
+            self.logger.info("Controller closed; ignoring request to set %sK", target)
+            return False
+
+        if self._transition_thread and self._transition_thread.is_alive():
+            if target == self._transition_target:
+                return True  # Already heading there; let the running transition finish.
+        self._cancel_transition()
+        self.logger.info(
+            "Setting Night Light to %s at strength %s (%sK -> %sK over %s min)",
             "ON" if state.enabled else "OFF",
             strength,
+            self.current_kelvin,
+            target,
             transition_minutes,
         )
-        # Return False to indicate no system change occurred.
-        return False
+        if transition_minutes <= 0 or self.current_kelvin == target:
+            applied = self._apply_ramp(self.ramp_cache.get(target))
+            if applied:
+                self.current_kelvin = target
+            return applied
+
+        steps = transition_minutes * TRANSITION_STEPS_PER_MINUTE
+        frames = self.ramp_cache.transition(self.current_kelvin, target, steps)
+        interval = transition_minutes * 60 / len(frames)
+        self._transition_stop.clear()
+        self._transition_target = target
+        self._transition_thread = threading.Thread(
+            target=self._run_transition,
+            args=(frames, interval, self.current_kelvin, target),
+            daemon=True,
+        )
+        self._transition_thread.start()
+        return True
+
+    def _apply_ramp(self, ramp: np.ndarray) -> bool:
+        self._touched_display = True
+        return self.backend.apply(ramp)
+
+    def _run_transition(
+        self, frames: Sequence[np.ndarray], interval: float, start: int, target: int
+    ) -> None:
+        previous: Optional[np.ndarray] = None
+        for index, frame in enumerate(frames, start=1):
+            # Consecutive steps often share a quantized ramp; skip the redundant call.
+            if frame is not previous and not self._apply_ramp(frame):
+                self.logger.warning(
+                    "Transition to %sK aborted at %sK: gamma ramp not applied", target, self.current_kelvin
+                )
+                break
+            previous = frame
+            self.current_kelvin = round(start + (target - start) * index / len(frames))
+            if index < len(frames) and self._transition_stop.wait(interval):
+                break
+        # After an abort or cancel this is where the display stopped, not the old target.
+        self._transition_target = self.current_kelvin
+
+    def _cancel_transition(self) -> None:
+        self._transition_stop.set()
+        if self._transition_thread and self._transition_thread is not threading.current_thread():
+            self._transition_thread.join(timeout=2)
+        self._transition_thread = None
+
+    def _restore_neutral(self) -> bool:
+        applied = self.backend.apply(self.ramp_cache.get(NEUTRAL_KELVIN))
+        if applied:
+            self.current_kelvin = NEUTRAL_KELVIN
+            self._transition_target = NEUTRAL_KELVIN
+            self._touched_display = False
+        else:
+            self.logger.warning("Could not restore the neutral gamma ramp")
+        return applied
+
+    def reset(self) -> bool:
+        """
+        Cancel any transition, restore the neutral ramp and stop applying.
+
+        Call on exit: gamma ramps outlive the process. Afterwards real
+        (non-dry-run) applies are refused, so a tick still finishing on the
+        scheduler thread cannot re-tint the screen. A display never touched
+        (e.g. dry run only) is left alone. Returns True if the display is neutral.
+        """
+        with self._lock:
+            self._closed = True
+            self._cancel_transition()
+            if not self._touched_display:
+                return True
+            return self._restore_neutral()
@@ -0,0 +1,10 @@
+from datetime import datetime, timezone
+
+from home_made_flux.core.logic import ScheduleDecision
+from home_made_flux.core.scheduler import SchedulerResult
+
+
+def make_result() -> SchedulerResult:
+    now = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+    decision = ScheduleDecision(should_enable=False, target_strength=50, next_change=now, reason="test")
+    return SchedulerResult(decision=decision, applied=True, timestamp=now, message="ok")
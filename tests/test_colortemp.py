@@ -0,0 +1,159 @@
+import logging
+import unittest
+
+import numpy as np
+
+from home_made_flux.core.colortemp import (
+    NEUTRAL_KELVIN,
+    WARMEST_KELVIN,
+    GammaRampCache,
+    build_gamma_ramp,
+    quantize_kelvin,
+    strength_to_kelvin,
+)
+from home_made_flux.windows.nightlight import NightLightController, NightLightState
+
+
+class ColorTemperatureTests(unittest.TestCase):
+    def test_strength_maps_to_kelvin_range(self) -> None:
+        self.assertEqual(strength_to_kelvin(0), NEUTRAL_KELVIN)
+        self.assertEqual(strength_to_kelvin(100), WARMEST_KELVIN)
+        self.assertEqual(strength_to_kelvin(150), WARMEST_KELVIN)
+        self.assertGreater(strength_to_kelvin(25), strength_to_kelvin(75))
+
+    def test_quantize_rounds_and_clamps(self) -> None:
+        self.assertEqual(quantize_kelvin(3426), 3450)
+        self.assertEqual(quantize_kelvin(200), 1000)
+
+    def test_neutral_ramp_is_identity(self) -> None:
+        ramp = build_gamma_ramp(NEUTRAL_KELVIN)
+        self.assertEqual(ramp.shape, (3, 256))
+        self.assertEqual(ramp.dtype, np.uint16)
+        expected = np.arange(256, dtype=np.uint16) * 257
+        for channel in ramp:
+            np.testing.assert_array_equal(channel, expected)
+
+    def test_warm_ramp_attenuates_blue_most(self) -> None:
+        red, green, blue = build_gamma_ramp(2700)[:, -1]
+        self.assertEqual(red, 65535)
+        self.assertGreater(green, blue)
+
+    def test_state_kelvin_neutral_when_disabled(self) -> None:
+        self.assertEqual(NightLightState(enabled=False, strength=80).kelvin, NEUTRAL_KELVIN)
+        self.assertEqual(NightLightState(enabled=True, strength=100).kelvin, WARMEST_KELVIN)
+
+
+class GammaRampCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = GammaRampCache()
+
+    def test_get_shares_ramps_per_quantized_temperature(self) -> None:
+        ramp = self.cache.get(3410)
+        self.assertIs(self.cache.get(3390), ramp)
+        self.assertFalse(ramp.flags.writeable)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_transition_ends_at_target_and_is_memoized(self) -> None:
+        frames = self.cache.transition(6500, 3000, steps=20)
+        self.assertEqual(len(frames), 20)
+        self.assertIs(frames[-1], self.cache.get(3000))
+        self.assertIs(self.cache.transition(6500, 3000, steps=20), frames)
+        blues = [frame[2, -1] for frame in frames]
+        self.assertEqual(blues, sorted(blues, reverse=True))
+
+    def test_transition_cache_is_bounded(self) -> None:
+        cache = GammaRampCache(max_transitions=2)
+        first = cache.transition(6500, 3000, steps=5)
+        cache.transition(6500, 2500, steps=5)
+        cache.transition(6500, 2000, steps=5)
+        self.assertIsNot(cache.transition(6500, 3000, steps=5), first)
+
+
+class _RecordingBackend:
+    def __init__(self, fail_after: int | None = None) -> None:
+        self.applied: list[np.ndarray] = []
+        self.fail_after = fail_after
+
+    def apply(self, ramp: np.ndarray) -> bool:
+        if self.fail_after is not None and len(self.applied) >= self.fail_after:
+            return False
+        self.applied.append(ramp)
+        return True
+
+
+class NightLightControllerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = _RecordingBackend()
+        self.controller = NightLightController(logging.getLogger("test"), backend=self.backend)  # type: ignore[arg-type]
+        self.controller.is_windows = True
+
+    def test_dry_run_never_touches_backend(self) -> None:
+        self.assertTrue(self.controller.apply_state(NightLightState(True, 60), 0, dry_run=True))
+        self.assertEqual(self.backend.applied, [])
+
+    def test_instant_apply_uses_cached_ramp(self) -> None:
+        self.assertTrue(self.controller.apply_state(NightLightState(True, 100), 0, dry_run=False))
+        self.assertEqual(len(self.backend.applied), 1)
+        self.assertIs(self.backend.applied[0], self.controller.ramp_cache.get(WARMEST_KELVIN))
+        self.assertEqual(self.controller.current_kelvin, WARMEST_KELVIN)
+
+    def test_stepped_transition_reaches_target(self) -> None:
+        frames = self.controller.ramp_cache.transition(NEUTRAL_KELVIN, 3000, steps=100)
+        self.controller._run_transition(frames, 0, NEUTRAL_KELVIN, 3000)
+        self.assertEqual(self.controller.current_kelvin, 3000)
+        self.assertIs(self.backend.applied[-1], self.controller.ramp_cache.get(3000))
+        # Repeated quantized frames are handed to the backend only once.
+        self.assertEqual(len(self.backend.applied), len({id(frame) for frame in frames}))
+
+    def test_cancelled_transition_stops_after_current_step(self) -> None:
+        frames = self.controller.ramp_cache.transition(NEUTRAL_KELVIN, 3000, steps=10)
+        self.controller._transition_stop.set()
+        self.controller._run_transition(frames, 0, NEUTRAL_KELVIN, 3000)
+        self.assertEqual(len(self.backend.applied), 1)
+        self.assertEqual(self.controller.current_kelvin, 6150)
+        self.assertEqual(self.controller._transition_target, 6150)
+
+    def test_failed_transition_is_logged_and_target_cleared(self) -> None:
+        self.backend.fail_after = 2
+        frames = self.controller.ramp_cache.transition(NEUTRAL_KELVIN, 3000, steps=10)
+        with self.assertLogs("test.nightlight", level="WARNING"):
+            self.controller._run_transition(frames, 0, NEUTRAL_KELVIN, 3000)
+        self.assertEqual(self.controller.current_kelvin, 5800)
+        self.assertEqual(self.controller._transition_target, 5800)
+
+    def test_reset_restores_neutral_ramp(self) -> None:
+        self.controller.apply_state(NightLightState(True, 100), 0, dry_run=False)
+        self.assertTrue(self.controller.reset())
+        self.assertIs(self.backend.applied[-1], self.controller.ramp_cache.get(NEUTRAL_KELVIN))
+        self.assertEqual(self.controller.current_kelvin, NEUTRAL_KELVIN)
+
+    def test_switching_to_dry_run_restores_neutral(self) -> None:
+        self.controller.apply_state(NightLightState(True, 100), 0, dry_run=False)
+        self.controller.apply_state(NightLightState(False, 100), 0, dry_run=True)
+        self.assertIs(self.backend.applied[-1], self.controller.ramp_cache.get(NEUTRAL_KELVIN))
+        self.assertEqual(self.controller.current_kelvin, NEUTRAL_KELVIN)
+        self.controller.apply_state(NightLightState(True, 100), 0, dry_run=True)
+        self.assertEqual(len(self.backend.applied), 2)
+
+    def test_switching_to_dry_run_cancels_transition(self) -> None:
+        self.controller.apply_state(NightLightState(True, 100), 60, dry_run=False)
+        self.controller.apply_state(NightLightState(True, 100), 60, dry_run=True)
+        self.assertIsNone(self.controller._transition_thread)
+        self.assertEqual(self.controller.current_kelvin, NEUTRAL_KELVIN)
+
+    def test_reset_refuses_later_real_applies(self) -> None:
+        self.controller.apply_state(NightLightState(True, 100), 0, dry_run=False)
+        self.controller.reset()
+        applied = len(self.backend.applied)
+        self.assertFalse(self.controller.apply_state(NightLightState(True, 100), 0, dry_run=False))
+        self.assertEqual(len(self.backend.applied), applied)
+        self.assertEqual(self.controller.current_kelvin, NEUTRAL_KELVIN)
+
+    def test_reset_leaves_untouched_display_alone(self) -> None:
+        self.controller.apply_state(NightLightState(True, 100), 0, dry_run=True)
+        self.assertTrue(self.controller.reset())
+        self.assertEqual(self.backend.applied, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
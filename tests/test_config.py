@@ -0,0 +1,119 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from home_made_flux.util.config import (
+    AppConfig,
+    ConfigWatcher,
+    DebouncedSaver,
+    changed_fields,
+    load_config,
+    read_config,
+    save_config,
+    update_config,
+)
+
+
+class ConfigPersistenceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.path = self.dir / "config.json"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_save_round_trips_without_leaving_temp_files(self) -> None:
+        save_config(AppConfig(night_light_strength=70), self.path)
+        save_config(AppConfig(night_light_strength=80), self.path)
+        self.assertEqual(load_config(self.path).night_light_strength, 80)
+        self.assertEqual([p.name for p in self.dir.iterdir()], ["config.json"])
+
+    def test_load_resets_only_invalid_fields(self) -> None:
+        raw = {"night_light_strength": "80", "transition_minutes": 10.0, "dry_run": False, "bogus": 1}
+        self.path.write_text(json.dumps(raw), encoding="utf-8")
+        with self.assertLogs("home_made_flux.config", level="WARNING") as logs:
+            config = load_config(self.path)
+        self.assertEqual(config, AppConfig(dry_run=False))
+        output = "\n".join(logs.output)
+        for name in ("night_light_strength", "transition_minutes", "bogus"):
+            self.assertIn(name, output)
+
+    def test_read_rejects_out_of_range(self) -> None:
+        self.path.write_text(json.dumps({"schedule_interval_minutes": 0}), encoding="utf-8")
+        with self.assertRaises(ValueError):
+            read_config(self.path)
+
+    def test_save_reports_failure(self) -> None:
+        self.assertFalse(save_config(AppConfig(), self.dir / "missing" / "config.json"))
+
+    def test_changed_fields(self) -> None:
+        old = AppConfig()
+        new = update_config(old, {"schedule_interval_minutes": 1, "dry_run": False})
+        self.assertEqual(changed_fields(old, new), {"schedule_interval_minutes", "dry_run"})
+        self.assertEqual(changed_fields(old, AppConfig()), set())
+
+    def test_debounced_saver_writes_latest_only(self) -> None:
+        saved: list[bool] = []
+        saver = DebouncedSaver(self.path, delay=60, on_saved=saved.append)
+        for strength in (10, 20, 30):
+            saver.save(AppConfig(night_light_strength=strength))
+        self.assertFalse(self.path.exists())
+        saver.flush()
+        saver.flush()
+        self.assertEqual(load_config(self.path).night_light_strength, 30)
+        self.assertEqual(saved, [True])
+
+    def test_debounced_saver_fires_after_delay(self) -> None:
+        saver = DebouncedSaver(self.path, delay=0.01)
+        saver.save(AppConfig(transition_minutes=3))
+        deadline = time.monotonic() + 2
+        while not self.path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(load_config(self.path).transition_minutes, 3)
+
+
+class ConfigWatcherTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "config.json"
+        save_config(AppConfig(), self.path)
+        self.watcher = ConfigWatcher(self.path)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_unchanged_file_is_not_reloaded(self) -> None:
+        self.assertIsNone(self.watcher.poll())
+
+    def test_external_edit_is_detected_once(self) -> None:
+        save_config(AppConfig(schedule_interval_minutes=1), self.path)
+        updated = self.watcher.poll()
+        self.assertIsNotNone(updated)
+        self.assertEqual(updated.schedule_interval_minutes, 1)
+        self.assertIsNone(self.watcher.poll())
+
+    def test_malformed_edit_is_skipped(self) -> None:
+        self.path.write_text("{not json", encoding="utf-8")
+        self.assertIsNone(self.watcher.poll())
+        self.path.write_text(json.dumps({"dry_run": False}), encoding="utf-8")
+        updated = self.watcher.poll()
+        self.assertIsNotNone(updated)
+        self.assertFalse(updated.dry_run)
+
+    def test_wrong_typed_value_is_skipped(self) -> None:
+        self.path.write_text(json.dumps({"schedule_interval_minutes": "5"}), encoding="utf-8")
+        self.assertIsNone(self.watcher.poll())
+        self.path.write_text(json.dumps({"night_light_strength": 500}), encoding="utf-8")
+        self.assertIsNone(self.watcher.poll())
+
+    def test_mark_current_ignores_own_writes(self) -> None:
+        save_config(AppConfig(dry_run=False), self.path)
+        self.watcher.mark_current()
+        self.assertIsNone(self.watcher.poll())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import tempfile
+import time
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from home_made_flux.core.scheduler import Scheduler
+from home_made_flux.util.profiling import TickProfiler
+from tests.fixtures import make_result
+
+
+class TickProfilerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.out = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_every_nth_tick_is_profiled(self) -> None:
+        profiler = TickProfiler(self.out, every_n_ticks=3)
+        for _ in range(6):
+            self.assertEqual(profiler.run(lambda: 42), 42)
+        names = sorted(p.name for p in self.out.glob("*.prof"))
+        self.assertEqual(len(names), 2)
+        self.assertTrue(names[0].startswith("tick-000003-"))
+
+    def test_only_slow_ticks_are_written(self) -> None:
+        profiler = TickProfiler(self.out, slow_tick_ms=20)
+        profiler.run(lambda: None)
+        profiler.run(lambda: time.sleep(0.03))
+        names = [p.name for p in self.out.glob("*.prof")]
+        self.assertEqual(len(names), 1)
+        self.assertTrue(names[0].endswith("-slow.prof"))
+
+    def test_output_is_rotated(self) -> None:
+        profiler = TickProfiler(self.out, every_n_ticks=1, max_files=2)
+        for _ in range(5):
+            profiler.run(lambda: None)
+        self.assertEqual(len(list(self.out.glob("*.prof"))), 2)
+
+    def test_manual_triggers_do_not_shift_tick_sampling(self) -> None:
+        profiler = TickProfiler(self.out, every_n_ticks=2)
+        profiler.run(lambda: None)
+        profiler.run(lambda: None, label="trigger")
+        profiler.run(lambda: None)
+        self.assertEqual(len(list(self.out.glob("tick-000002-*.prof"))), 1)
+        self.assertEqual(list(self.out.glob("trigger-*.prof")), [])
+
+    def test_rotation_keeps_startup_profile(self) -> None:
+        self.out.mkdir(exist_ok=True)
+        (self.out / "startup.prof").write_bytes(b"")
+        profiler = TickProfiler(self.out, every_n_ticks=1, max_files=1)
+        for _ in range(3):
+            profiler.run(lambda: None)
+        self.assertTrue((self.out / "startup.prof").exists())
+        self.assertEqual(len(list(self.out.glob("tick-*.prof"))), 1)
+
+    def test_tick_during_startup_profile_runs_unprofiled(self) -> None:
+        profiler = TickProfiler(self.out, every_n_ticks=1)
+        startup = self.out / "startup.prof"
+        # Simulates the scheduler's first tick firing while startup is still profiled.
+        result = profiler.profile_call(lambda: profiler.run(lambda: 7), startup)
+        self.assertEqual(result, 7)
+        self.assertTrue(startup.exists())
+        self.assertEqual(list(self.out.glob("tick-*.prof")), [])
+
+    def test_enable_failure_falls_back_to_plain_run(self) -> None:
+        profiler = TickProfiler(self.out, every_n_ticks=1)
+        with mock.patch("cProfile.Profile.enable", side_effect=ValueError("Another profiling tool is already active")):
+            with self.assertLogs("home_made_flux.profiling", level="WARNING"):
+                self.assertEqual(profiler.run(lambda: 3), 3)
+                self.assertEqual(profiler.profile_call(lambda: 4, self.out / "startup.prof"), 4)
+        self.assertEqual(list(self.out.glob("*.prof")), [])
+        self.assertFalse(profiler._lock.locked())
+
+    def test_memory_snapshots_written_while_tracing(self) -> None:
+        profiler = TickProfiler(self.out, trace_memory=True)
+        profiler.thread_started()
+        try:
+            profiler.run(lambda: [0] * 1000)
+        finally:
+            profiler.thread_stopped()
+        self.assertEqual(len(list(self.out.glob("*.tracemalloc"))), 1)
+
+    def test_scheduler_skips_disabled_profiler(self) -> None:
+        scheduler = Scheduler(interval_minutes=5, tick=make_result, profiler=TickProfiler(self.out))
+        self.assertIsNone(scheduler.profiler)
+        scheduler.trigger_once()
+        self.assertEqual(list(self.out.iterdir()), [])
+
+    def test_trigger_once_is_profiled(self) -> None:
+        scheduler = Scheduler(interval_minutes=5, tick=make_result, profiler=TickProfiler(self.out, every_n_ticks=1))
+        scheduler.trigger_once()
+        self.assertEqual(len(list(self.out.glob("trigger-*.prof"))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
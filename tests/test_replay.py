@@ -0,0 +1,113 @@
+import threading
+import unittest
+from unittest import mock
+from dataclasses import fields
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from home_made_flux.core.clock import Clock, SimulatedClock
+from home_made_flux.core.pipeline import TickSettings
+from home_made_flux.replay import NullGammaBackend, replay
+from home_made_flux.util.config import AppConfig
+from home_made_flux.windows.nightlight import GammaRampBackend
+
+
+class SimulatedClockTests(unittest.TestCase):
+    def test_wait_advances_virtual_time(self) -> None:
+        clock = SimulatedClock(datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc))
+        self.assertFalse(clock.wait(threading.Event(), 90))
+        self.assertEqual(clock.now(), datetime(2024, 6, 1, 12, 1, 30, tzinfo=timezone.utc))
+
+    def test_wait_returns_immediately_when_event_set(self) -> None:
+        clock = SimulatedClock(datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc))
+        event = threading.Event()
+        event.set()
+        self.assertTrue(clock.wait(event, 90))
+        self.assertEqual(clock.monotonic(), datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc).timestamp())
+
+    def test_now_follows_dst(self) -> None:
+        berlin = ZoneInfo("Europe/Berlin")
+        clock = SimulatedClock(datetime(2024, 3, 31, 1, 30, tzinfo=berlin))
+        clock.advance(timedelta(hours=1))
+        self.assertEqual(clock.now().hour, 3)
+        self.assertEqual(clock.now().utcoffset(), timedelta(hours=2))
+
+    def test_incomplete_clock_fails_at_construction(self) -> None:
+        class NoWait(Clock):
+            def now(self) -> datetime:
+                return datetime.now(timezone.utc)
+
+            def monotonic(self) -> float:
+                return 0.0
+
+        with self.assertRaises(TypeError):
+            NoWait()  # type: ignore[abstract]
+
+    def test_requires_aware_start(self) -> None:
+        with self.assertRaises(ValueError):
+            SimulatedClock(datetime(2024, 1, 1))
+
+
+class TickSettingsTests(unittest.TestCase):
+    def test_from_config_uses_app_config_names(self) -> None:
+        config = AppConfig(night_light_strength=70, dry_run=False, schedule_interval_minutes=1)
+        settings = TickSettings.from_config(config)
+        self.assertEqual(settings.night_light_strength, 70)
+        self.assertFalse(settings.dry_run)
+        self.assertTrue({f.name for f in fields(TickSettings)} <= {f.name for f in fields(AppConfig)})
+
+
+class ReplayTests(unittest.TestCase):
+    def test_fallback_schedule_over_dst_switch(self) -> None:
+        berlin = ZoneInfo("Europe/Berlin")
+        start = datetime(2024, 3, 30, tzinfo=berlin)
+        report = replay(start, datetime(2024, 4, 1, tzinfo=berlin))
+        # 47 real hours of 5-minute ticks: the night of the switch is an hour short.
+        self.assertEqual(report.ticks, 47 * 12)
+        changes = [(t.timestamp.day, t.timestamp.hour, t.enabled) for t in report.transitions]
+        self.assertEqual(
+            changes,
+            [(30, 0, True), (30, 7, False), (30, 19, True), (31, 7, False), (31, 19, True)],
+        )
+
+    def test_recorded_responses_are_used(self) -> None:
+        start = datetime(2024, 6, 1, tzinfo=timezone.utc)
+        responses = {
+            "2024-06-01": {"sunrise": "2024-06-01T04:30:00+00:00", "sunset": "2024-06-01T21:15:00+00:00"},
+        }
+        report = replay(start, start + timedelta(days=1), sun_responses=responses)
+        self.assertEqual(
+            [(t.timestamp.hour, t.timestamp.minute, t.enabled) for t in report.transitions],
+            [(0, 0, True), (4, 30, False), (21, 15, True)],
+        )
+
+    def test_strength_and_override_in_log(self) -> None:
+        start = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+        settings = TickSettings(night_light_strength=80, manual_override=True)
+        report = replay(start, start + timedelta(hours=1), settings=settings)
+        self.assertEqual(report.ticks, 12)
+        self.assertEqual(len(report.transitions), 1)
+        self.assertEqual(report.transitions[0].strength, 80)
+        self.assertEqual(report.transitions[0].reason, "Manual override")
+
+    def test_replay_never_touches_display(self) -> None:
+        start = datetime(2024, 6, 1, tzinfo=timezone.utc)
+        settings = TickSettings(dry_run=False, transition_minutes=10)
+        with mock.patch("platform.system", return_value="Windows"), mock.patch.object(
+            GammaRampBackend, "apply", return_value=True
+        ) as gdi_apply, mock.patch.object(NullGammaBackend, "apply", return_value=True) as null_apply:
+            report = replay(start, start + timedelta(days=2), settings=settings)
+        self.assertEqual(report.ticks, 2 * 24 * 12)
+        gdi_apply.assert_not_called()
+        null_apply.assert_not_called()
+
+    def test_year_replay_is_fast(self) -> None:
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        report = replay(start, start + timedelta(days=365), interval_minutes=30)
+        self.assertEqual(report.ticks, 365 * 48)
+        self.assertEqual(len(report.transitions), 1 + 365 * 2)
+        self.assertLess(report.wall_seconds, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
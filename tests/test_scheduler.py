@@ -0,0 +1,53 @@
+import threading
+import unittest
+
+from home_made_flux.core.scheduler import Scheduler, SchedulerResult
+from tests.fixtures import make_result
+
+
+class SchedulerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ticks = 0
+        self.ticked = threading.Event()
+
+    def _tick(self) -> SchedulerResult:
+        self.ticks += 1
+        self.ticked.set()
+        return make_result()
+
+    def _wait_for_tick(self) -> None:
+        self.assertTrue(self.ticked.wait(2))
+        self.ticked.clear()
+
+    def test_wake_runs_next_tick_immediately(self) -> None:
+        scheduler = Scheduler(interval_minutes=60, tick=self._tick)
+        scheduler.start()
+        try:
+            self._wait_for_tick()
+            scheduler.wake()
+            self._wait_for_tick()
+            self.assertEqual(self.ticks, 2)
+        finally:
+            scheduler.stop()
+
+    def test_set_interval_applies_to_current_wait(self) -> None:
+        scheduler = Scheduler(interval_minutes=60, tick=self._tick)
+        scheduler.start()
+        try:
+            self._wait_for_tick()
+            scheduler.set_interval(0)  # Clamped to the 1 second minimum.
+            self._wait_for_tick()
+        finally:
+            scheduler.stop()
+        self.assertFalse(scheduler._thread.is_alive())
+
+    def test_set_interval_coerces_and_clamps(self) -> None:
+        scheduler = Scheduler(interval_minutes=5, tick=self._tick)
+        scheduler.set_interval("7")  # type: ignore[arg-type]
+        self.assertEqual(scheduler.interval_minutes, 7)
+        scheduler.set_interval(-3)
+        self.assertEqual(scheduler.interval_minutes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()